@@ -37,6 +37,7 @@ class BaseBool(object):
         logicop: str
             The boolean logic operator used to join the conditions
     '''
+    __slots__ = ('conditions',)
     logicop = None
 
     def __init__(self, data):
@@ -82,14 +83,17 @@ class BaseBool(object):
 
 class BoolNot(BaseBool):
     ''' Class for boolean Not logic '''
+    __slots__ = ()
     logicop = 'not'
 
 
 class BoolAnd(BaseBool):
     ''' Class for boolean And logic '''
+    __slots__ = ()
     logicop = 'and'
 
 
 class BoolOr(BaseBool):
     ''' Class for boolean Or logic '''
+    __slots__ = ()
     logicop = 'or'
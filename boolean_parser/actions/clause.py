@@ -42,6 +42,7 @@ class BaseAction(object):
         input_clause: str
             The original input clause element
     '''
+    __slots__ = ('parsed_clause', 'data', 'base', 'name', 'fullname')
 
     def __init__(self, data):
         self.parsed_clause = data
@@ -61,10 +62,8 @@ class BaseAction(object):
             self.base = None
             self.name = name
 
-    @property
-    def fullname(self):
-        ''' The full parameter name, including any base '''
-        return f'{self.base}.{self.name}' if self.base else self.name
+        # the full parameter name, including any base
+        self.fullname = name
 
 
 class Word(BaseAction):
@@ -75,6 +74,7 @@ class Word(BaseAction):
     "alpha" or "alpha and beta or not charlie".
 
     '''
+    __slots__ = ()
 
     def __init__(self, data):
         super(Word, self).__init__(data)
@@ -116,6 +116,7 @@ class Condition(BaseAction):
             Optional second value, assigned when a "between" condition is used.
 
     '''
+    __slots__ = ('operator', 'value', 'value2')
 
     def __init__(self, data):
         super(Condition, self).__init__(data)
@@ -15,6 +15,7 @@ from __future__ import absolute_import, division, print_function
 
 import decimal
 import inspect
+import weakref
 from datetime import date, datetime
 from operator import eq, ge, gt, le, lt, ne
 
@@ -29,16 +30,103 @@ from boolean_parser.parsers.base import BooleanParserException
 
 opdict = {'<=': le, '>=': ge, '>': gt, '<': lt, '!=': ne, '==': eq, '=': eq}
 
+# comparison functions for the plain comparison operators
+_comparators = {'<': lt, '<=': le, '>': gt, '>=': ge}
+
+# whether a ModelClass has a usable attribute for a parameter, indexed by ModelClass
+_model_fields = weakref.WeakKeyDictionary()
+
+# python field types whose values are cast rather than lowercased, and their cast type
+_cast_types = {float: float, decimal.Decimal: float, int: int, bool: bool,
+               date: date, datetime: datetime}
+_cast_datatypes = frozenset(_cast_types.values())
+
+# errors raised when a value cannot be cast
+_cast_errors = (ValueError, SyntaxError)
+
+# accepted string literals for boolean values
+_bool_values = {'true': True, 't': True, '1': True, 'yes': True,
+                'false': False, 'f': False, '0': False, 'no': False}
+
+
+def _lookup_field(mixin, models, field_name, base_name):
+    ''' Find the model and SQLA attribute for a parameter name
+
+    Whether a model matches a parameter name is cached per model, so repeated
+    lookups skip the checks in ``_get_field``.  Models are weakly referenced
+    by the cache and the cached values do not refer back to them, so models
+    and aliases can still be garbage collected.
+
+    Parameters:
+        mixin (type):
+            The SQLAMixin class performing the lookup
+        models (list):
+            A list of ModelClasses
+        field_name (str):
+            The database field name
+        base_name (str):
+            The database table name
+
+    Returns:
+        A tuple of the matched ModelClass and SQLA instrumented attribute
+    '''
+    key = (mixin, field_name, base_name)
+
+    for model in models:
+        matches = _model_fields.get(model)
+        if matches is None:
+            matches = _model_fields[model] = {}
+
+        # check if the model has a usable SQLA instrumented attribute
+        if key not in matches:
+            field = mixin._get_field(model, field_name, base_name=base_name)
+            matches[key] = field is not None and hasattr(field, 'type') and \
+                hasattr(field, 'ilike')
+
+        # if there is an attribute then use that model
+        if matches[key]:
+            return model, getattr(model, field_name)
+
+    # raise if no attribute found
+    tables = ', '.join(model.__tablename__ for model in models)
+    raise BooleanParserException(f'Field {field_name} not found in tables: {tables}')
+
+
 class SQLAMixin(object):
     ''' A Mixin class to apply SQLAlchemy filter parsing
 
     This mixin adds a ``filter`` method to the parsed result which converts
     the parsed string object into an appropriate SQLAlchemy filter condition to be used
-    in SQLAlchemy queries.
+    in SQLAlchemy queries.  It must be combined with a ``Condition`` action, e.g.
+    ``class MyCondition(SQLAMixin, Condition)``.
+
+    Attributes:
+        bindname: str
+            The name used to bind the parameter value
+        bindname2: str
+            The name used to bind the second parameter value of a "between" condition,
+            if any
 
     '''
+    __slots__ = ()
+
+    def __init__(self, data):
+        super(SQLAMixin, self).__init__(data)
+        self._has_value2 = hasattr(self, 'value2')
+        self.bindname = self.fullname
+        self.bindname2 = f'{self.fullname}_2' if self._has_value2 else None
 
-    def _check_models(self, classes):
+        # the (model, field) resolved by bind_model
+        self._resolved = None
+
+        # the comparison function for plain comparison operators
+        self._op = _comparators.get(self.operator)
+
+        # a hashable key identifying the condition
+        self._key = (self.fullname, self.operator, self.value, getattr(self, 'value2', None))
+
+    @staticmethod
+    def _check_models(classes):
         ''' Check the input modelclass format
 
         Checks if input classes is a module of modelclasses, a list of modelclasses
@@ -54,9 +142,9 @@ class SQLAMixin(object):
 
         # an entire module of classes
         if inspect.ismodule(classes):
-            # an entire module of classes
-            models = [i[1] for i in inspect.getmembers(
-                classes, inspect.isclass) if hasattr(i[1], '__tablename__')]
+            # sort by name to keep the same model precedence as inspect.getmembers
+            models = [v for k, v in sorted(vars(classes).items())
+                      if isinstance(v, DeclarativeMeta) and hasattr(v, '__tablename__')]
         elif isinstance(classes, (list, tuple)):
             # a list of ModelClasses
             models = classes
@@ -65,12 +153,13 @@ class SQLAMixin(object):
             models = [classes]
 
         # check for proper modelclasses
-        allmeta = all([isinstance(m, DeclarativeMeta) or isinstance(m, AliasedClass) for m in models])
+        allmeta = all(isinstance(m, (DeclarativeMeta, AliasedClass)) for m in models)
         assert allmeta is True, 'All input classes must be of type SQLAlchemy ModelClasses'
 
         return models
 
-    def _get_field(self, modelclass, field_name, base_name=None):
+    @staticmethod
+    def _get_field(modelclass, field_name, base_name=None):
         ''' Return a SQLAlchemy attribute from a field name.
 
         Checks that a given model contains the named field.
@@ -104,36 +193,66 @@ class SQLAMixin(object):
 
         return field
 
-    def filter(self, modelclass):
-        ''' Return the condition as an SQLalchemy query filter condition
+    def bind_model(self, modelclass):
+        ''' Resolve the condition parameter against a set of models
 
-        Loops over all models and creates a filter condition for that model
-        given the input filter parameters.
+        Finds the model and SQLA attribute for the parameter ahead of time so
+        that subsequent calls to ``filter`` with no models can skip the lookup.
 
         Parameters:
             modelclass (objects):
                 A set of ModelClasses to use in the filter condition
 
         Returns:
-            A SQL query filter condition
+            The bound condition
+
+        Example:
+            >>> res = SQLAParser('table.x > 5').parse()
+            >>> res.bind_model(TableModel).filter()
         '''
 
         assert modelclass is not None, 'No input found'
 
-        condition = None
-        models = self._check_models(modelclass)
+        return self._bind_models(self._check_models(modelclass))
+
+    def _bind_models(self, models):
+        ''' Resolve the condition parameter against already checked models
 
-        for model in models:
-            # get the SQLA instrumented attribute
-            field = self._get_field(model, self.name, base_name=self.base)
+        Parameters:
+            models (list):
+                A list of ModelClasses, as returned by ``_check_models``
 
-            # if there is an attribute then break and use that model
-            if field and hasattr(field, 'type') and hasattr(field, 'ilike'):
-                break
+        Returns:
+            The bound condition
+        '''
+        self._resolved = _lookup_field(type(self), models, self.name, self.base)
+        return self
 
-        # raise if no attribute found
-        if not field:
-            raise BooleanParserException(f'Table {model.__tablename__} does not have field {self.name}')
+    def filter(self, modelclass=None):
+        ''' Return the condition as an SQLalchemy query filter condition
+
+        Loops over all models and creates a filter condition for that model
+        given the input filter parameters.  If no models are given, uses the
+        models previously bound with ``bind_model``.  Passing models does not
+        change the bound models.
+
+        Parameters:
+            modelclass (objects):
+                A set of ModelClasses to use in the filter condition
+
+        Returns:
+            A SQL query filter condition
+        '''
+
+        condition = None
+
+        # get the model and SQLA instrumented attribute
+        if modelclass is None and self._resolved:
+            model, field = self._resolved
+        else:
+            assert modelclass is not None, 'No input found'
+            models = self._check_models(modelclass)
+            model, field = _lookup_field(type(self), models, self.name, self.base)
 
         # produce the SQLA filter condition
         condition = self._filter_one(model, field=field, condition=condition)
@@ -159,17 +278,8 @@ class SQLAMixin(object):
 
         # Return SQLAlchemy condition based on operator value
         # self.name is parameter name, lower_field is Table.parameterName
-        elif self.operator == '<':
-            condition = lower_field.__lt__(lower_value)
-
-        elif self.operator == '<=':
-            condition = lower_field.__le__(lower_value)
-
-        elif self.operator == '>':
-            condition = lower_field.__gt__(lower_value)
-
-        elif self.operator == '>=':
-            condition = lower_field.__ge__(lower_value)
+        elif self._op is not None:
+            condition = self._op(lower_field, lower_value)
 
         elif self.operator == '!=':
             field = getattr(model, self.name)
@@ -199,9 +309,10 @@ class SQLAMixin(object):
                 # x=*5  ->  x LIKE '%5'  (x ends with 5)
                 elif value.find('*') >= 0:
                     value = value.replace('*', '%')
-                    condition = lower_field.ilike(bindparam(self.fullname, value))
+                    condition = lower_field.ilike(bindparam(self.bindname, value, unique=True))
                 else:
-                    condition = lower_field.ilike('%' + bindparam(self.fullname, value) + '%')
+                    condition = lower_field.ilike(
+                        '%' + bindparam(self.bindname, value, unique=True) + '%')
             # For all other types, assume straight equality
             else:
                 field = getattr(model, self.name)
@@ -226,60 +337,78 @@ class SQLAMixin(object):
     def _bind_and_lower_value(self, field):
         ''' Bind and lower the value based on field type'''
 
+        # get the cast type from the python field type; strings have none
+        datatype = _cast_types.get(field.type.python_type)
+        if datatype:
+            return self._bind_cast_value(field, datatype)
+        return self._bind_string_value(field)
+
+    def _bind_cast_value(self, field, datatype):
+        ''' Bind the values cast to a numerical, boolean or date type
+
+        Parameters:
+            field (SQLA attribute):
+                SQLA instrumented attribute
+            datatype (object):
+                The cast type for the values
+
+        Returns:
+            The field and the bound values
+        '''
+
         lower_value_2 = None
 
-        # get python field type
-        ftypes = [float, bool, int, decimal.Decimal, date, datetime]
-        fieldtype = field.type.python_type
+        # bind the parameter value to the parameter name, typed as the field so the
+        # statement cache key does not depend on the value
+        value = self._cast_value(self.value, datatype=datatype)
+        lower_value = bindparam(self.bindname, value, type_=field.type, unique=True)
+        if self._has_value2:
+            value2 = self._cast_value(self.value2, datatype=datatype)
+            lower_value_2 = bindparam(self.bindname2, value2, type_=field.type, unique=True)
+
+        return field, lower_value, lower_value_2
+
+    def _bind_string_value(self, field):
+        ''' Bind the lowercased string values
+
+        Parameters:
+            field (SQLA attribute):
+                SQLA instrumented attribute
+
+        Returns:
+            The lowercase field and the bound lowercased values
+        '''
 
-        # format the values
-        value, lower_field = self._format_value(self.value, fieldtype, field)
-        if hasattr(self, 'value2'):
-            value2, lower_field = self._format_value(self.value2, fieldtype, field)
+        lower_value_2 = None
 
-        # bind the parameter value to the parameter name
-        boundvalue = bindparam(self.fullname, value, unique=True)
-        lower_value = func.lower(boundvalue) if fieldtype not in ftypes else boundvalue
-        if hasattr(self, 'value2'):
-            boundvalue2 = bindparam(self.fullname, value2, unique=True)
-            lower_value_2 = func.lower(boundvalue2) if fieldtype not in ftypes else boundvalue2
+        lower_value = self._bind_lower(self.bindname, self.value, field)
+        if self._has_value2:
+            lower_value_2 = self._bind_lower(self.bindname2, self.value2, field)
 
-        return lower_field, lower_value, lower_value_2
+        return func.lower(field), lower_value, lower_value_2
 
-    def _format_value(self, value, fieldtype, field):
-        ''' Formats the value based on the fieldtype
+    def _bind_lower(self, bindname, value, field):
+        ''' Bind a string value lowercased the same way as the field
 
-        Formats the value to proper numerical type and lowercases
-        the field for string fields.
+        ASCII values are lowercased in Python, which matches the database ``lower``.
+        Other values are lowercased by the database, since e.g. SQLite only
+        lowercases ASCII characters.
 
         Parameters:
+            bindname (str):
+                The name to bind the value to
             value (str):
-                The conditional value to format
-            fieldtype (object):
-                The python field type
+                The string value to bind
             field (SQLA attribute):
                 SQLA instrumented attribute
 
         Returns:
-            The formatted value and lowercase field
+            The bound lowercased value
         '''
 
-        lower_field = field
-        if fieldtype == float or fieldtype == decimal.Decimal:
-            out_value = self._cast_value(value, datatype=float)
-        elif fieldtype == int:
-            out_value = self._cast_value(value, datatype=int)
-        elif fieldtype == bool:
-            out_value = self._cast_value(value, datatype=bool)
-        elif fieldtype == date:
-            out_value = self._cast_value(value, datatype=date)
-        elif fieldtype == datetime:
-            out_value = self._cast_value(value, datatype=datetime)
-        else:
-            lower_field = func.lower(field)
-            out_value = value
-
-        return out_value, lower_field
+        if value.isascii():
+            return bindparam(bindname, value.lower(), type_=field.type, unique=True)
+        return func.lower(bindparam(bindname, value, type_=field.type, unique=True))
 
 
     def _to_bool(self, value):
@@ -302,17 +431,6 @@ class SQLAMixin(object):
               - "0"
               - "no"
         """
-        valid = {
-            "true": True,
-            "t": True,
-            "1": True,
-            "yes": True,
-            "false": False,
-            "f": False,
-            "0": False,
-            "no": False,
-        }
-
         if isinstance(value, bool):
             return value
 
@@ -320,8 +438,8 @@ class SQLAMixin(object):
             raise ValueError("Invalid literal for boolean. Not a string or boolean.")
 
         lower_value = value.lower()
-        if lower_value in valid:
-            return valid[lower_value]
+        if lower_value in _bool_values:
+            return _bool_values[lower_value]
 
         else:
             raise ValueError('Invalid literal for boolean: "%s"' % value)
@@ -386,13 +504,15 @@ class SQLAMixin(object):
             value (int|float|bool|date|datetime):
                 A numeric value to cast to a float or integer
             datatype (object):
-                The cast function. Can be either float, int or bool
+                The cast function. Can be either float, int, bool, date or datetime
 
         Returns:
             The value explicitly cast to an integer, float, boolean or datetime
         '''
 
-        assert datatype in [float, int, bool, date, datetime], 'datatype must be either float, int or bool'
+        if datatype not in _cast_datatypes:
+            raise ValueError('datatype must be either float, int, bool, date or datetime')
+
         try:
             if value.lower() == 'null':
                 out = 'null'
@@ -404,7 +524,7 @@ class SQLAMixin(object):
                 out = self._to_datetime(value)
             else:
                 out = datatype(value)
-        except (ValueError, SyntaxError):
+        except _cast_errors:
             raise BooleanParserException(f'Field {self.name} expects a {datatype.__name__} value. Received {value} instead.')
         else:
             return out
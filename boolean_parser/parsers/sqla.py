@@ -37,34 +37,94 @@ class SQLACondition(SQLAMixin, Condition):
     "{name: 'x', fullname: 'table.x', base: 'table', operator: '<', value: '4'}"
 
     '''
-    pass
+    __slots__ = ('bindname', 'bindname2', '_resolved', '_op', '_has_value2', '_key')
 
 
 class SQLBoolBase(BaseBool):
     ''' Class for handling boolean logic joins for SQLALchemy filter expressions '''
+    __slots__ = ('_key',)
 
-    def filter(self, models):
-        ''' Calls the filter method for each condition
+    def _get_conditions(self, data):
+        ''' Builds the list of conditions
+
+        Nested clauses joined by the same "and" or "or" logic are merged into
+        this clause, e.g. "(x > 1 and y < 2) and z > 3" becomes "and_(x>1, y<2, z>3)".
+        Also sets the hashable key identifying the clause.
+
+        Parameters:
+            data: list
+                A list of underlying conditions
+        '''
+        super(SQLBoolBase, self)._get_conditions(data)
+        if self.logicop != 'not':
+            conditions = []
+            for condition in self.conditions:
+                if isinstance(condition, SQLBoolBase) and condition.logicop == self.logicop:
+                    conditions.extend(condition.conditions)
+                else:
+                    conditions.append(condition)
+            self.conditions = conditions
+
+        self._key = (self.logicop, tuple(condition._key for condition in self.conditions))
+
+    def bind_model(self, models):
+        ''' Calls the bind_model method for each condition
+
+        Checks the input models once and resolves the parameters of all
+        conditions against them, so that ``filter`` can be called with no models.
 
         Parameters:
             models: list
                 A list of SQLAlchemy ORM models
+
+        Returns:
+            The bound boolean clause
+        '''
+        assert models is not None, 'No input found'
+        return self._bind_models(SQLAMixin._check_models(models))
+
+    def _bind_models(self, models):
+        ''' Calls the _bind_models method for each condition
+
+        Parameters:
+            models: list
+                A list of SQLAlchemy ORM models, as returned by ``_check_models``
+
+        Returns:
+            The bound boolean clause
+        '''
+        for condition in self.conditions:
+            condition._bind_models(models)
+        return self
+
+    def filter(self, models=None):
+        ''' Calls the filter method for each condition
+
+        Parameters:
+            models: list
+                A list of SQLAlchemy ORM models.  If not given, uses the models
+                bound with ``bind_model``.
         '''
+        # drop duplicate conditions, e.g. "x > 5 and x > 5" -> "x > 5"
+        unique = {condition._key: condition for condition in self.conditions}
         conditions = [condition.filter(models)
-                      for condition in self.conditions]
+                      for condition in unique.values()]
         return sqlaop[self.logicop](*conditions)
 
 
 class SQLANot(BoolNot, SQLBoolBase):
     ''' SQLalchemy class for boolean Not '''
+    __slots__ = ()
 
 
 class SQLAAnd(BoolAnd, SQLBoolBase):
     ''' SQLalchemy class for boolean And '''
+    __slots__ = ()
 
 
 class SQLAOr(BoolOr, SQLBoolBase):
     ''' SQLalchemy class for boolean Or '''
+    __slots__ = ()
 
 
 class SQLAParser(Parser):
@@ -12,8 +12,16 @@
 
 
 from __future__ import print_function, division, absolute_import
+import gc
+import types
+import weakref
 import pytest
+from boolean_parser.actions.clause import Condition
+from boolean_parser.clauses import condition, between_cond
+from boolean_parser.mixins import SQLAMixin
 from boolean_parser.parsers import SQLAParser
+from boolean_parser.parsers.base import BooleanParserException
+from tests import models
 from tests.models import ModelA, ModelB
 from sqlalchemy.sql.expression import BinaryExpression, BooleanClauseList
 from sqlalchemy.orm import aliased
@@ -33,7 +41,7 @@ def _make_filter(value):
         ("modela.x = 5", "modela.x = 5"),
         ("modela.x == 5", "modela.x = 5"),
         ("modela.name = Some_string", "lower(lower(modela.name)) LIKE lower('%' || 'Some_string' || '%')",),
-        ('modela.name == "Some_string"', "lower(modela.name) = lower('Some_string')"),
+        ('modela.name == "Some_string"', "lower(modela.name) = 'some_string'"),
         ("modela.name = null", "modela.name IS NULL"),
         ("modela.name == null", "modela.name IS NULL"),
         ("modela.bools = True", "modela.bools = true"),
@@ -43,6 +51,7 @@ def _make_filter(value):
         ("modela.datetimes == 2020-01-01T00:00", "modela.datetimes = '2020-01-01 00:00:00'",),
         ("modela.datetimes == 2020-01-01T00", "modela.datetimes = '2020-01-01 00:00:00'",),
         ("modela.datetimes == 2020-01-01", "modela.datetimes = '2020-01-01 00:00:00'",),
+        ("modela.x between 3 and 5", "modela.x BETWEEN 3 AND 5"),
     ],
     ids=[
         "gt",
@@ -60,6 +69,7 @@ def _make_filter(value):
         "eqdatetime_a",
         "eqdatetime_b",
         "eqdatetime_c",
+        "between",
     ],
 )
 def test_parse_filter(val, exp):
@@ -84,6 +94,168 @@ def test_parse_filter_with_alias(query, kls):
     assert query == ww
 
 
+@pytest.mark.parametrize('query, exp',
+                         [('modela.x > 5 and modela.x > 5', 'modela.x > 5'),
+                          ('modela.x > 5 or modela.y < 3 or modela.x > 5',
+                           'modela.x > 5 OR modela.y < 3'),
+                          ('(modela.x > 5 or modela.y < 3) and (modela.x > 5 or modela.y < 3)',
+                           'modela.x > 5 OR modela.y < 3')],
+                         ids=['and', 'or', 'nested'])
+def test_parse_filter_duplicates(query, exp):
+    ''' test duplicate conditions are dropped from the filter '''
+    f = _make_filter(query)
+    ww = str(f.compile(compile_kwargs={'literal_binds': True}))
+    assert exp == ww
+
+
+@pytest.mark.parametrize('query',
+                         ['modela.x > 5',
+                          'modela.x > 5 and (modelb.z < 3 or not modela.name = foo)'],
+                         ids=['single', 'multi'])
+def test_bind_model(query):
+    ''' test filtering with pre-bound models '''
+    models = [ModelA, ModelB]
+    e = SQLAParser(query).parse()
+    f = e.filter(models)
+    bound = SQLAParser(query).parse().bind_model(models).filter()
+    assert str(bound.compile(compile_kwargs={'literal_binds': True})) == \
+        str(f.compile(compile_kwargs={'literal_binds': True}))
+
+
+@pytest.mark.parametrize('query, other',
+                         [('modela.x > 5 and modelb.z < 2', 'modela.x > 7 and modelb.z < 2.5'),
+                          ('modela.name == foo', 'modela.name == bar'),
+                          ('modela.x between 1 and 2', 'modela.x between 3 and 9')],
+                         ids=['multi', 'str', 'between'])
+def test_filter_cache_key(query, other):
+    ''' test filters differing only in values share a statement cache key '''
+    f = _make_filter(query)
+    o = _make_filter(other)
+    assert f._generate_cache_key() == o._generate_cache_key()
+
+
+@pytest.mark.parametrize('query',
+                         ['modela.w > 5', 'modelb.x > 5', 'w > 5'],
+                         ids=['nofield', 'wrongtable', 'noname'])
+def test_parse_filter_fails(query):
+    ''' test a filter on a missing field raises an error '''
+    with pytest.raises(BooleanParserException) as cm:
+        SQLAParser(query).parse().filter([ModelA, ModelB])
+    assert 'not found in tables: modela, modelb' in str(cm.value)
+
+
+@pytest.mark.parametrize('query, exp, filt',
+                         [('(modela.x > 1 and modela.y < 2) and modelb.z > 3',
+                           'and_(x>1, y<2, z>3)',
+                           'modela.x > 1 AND modela.y < 2 AND modelb.z > 3.0'),
+                          ('modela.x > 1 or (modela.y < 2 or (modelb.z > 3 or modela.x < 0))',
+                           'or_(x>1, y<2, z>3, x<0)',
+                           'modela.x > 1 OR modela.y < 2 OR modelb.z > 3.0 OR modela.x < 0'),
+                          ('(modela.x > 1 or modela.y < 2) and modelb.z > 3',
+                           'and_(or_(x>1, y<2), z>3)',
+                           '(modela.x > 1 OR modela.y < 2) AND modelb.z > 3.0'),
+                          ('not (modela.x > 1 and modela.y < 2) and modelb.z > 3',
+                           'and_(not_(and_(x>1, y<2)), z>3)',
+                           'NOT (modela.x > 1 AND modela.y < 2) AND modelb.z > 3.0')],
+                         ids=['and', 'or', 'mixed', 'not'])
+def test_parse_flatten(query, exp, filt):
+    ''' test nested clauses of the same boolean logic are flattened '''
+    e = SQLAParser(query).parse()
+    assert exp == repr(e)
+    f = e.filter([ModelA, ModelB])
+    assert filt == str(f.compile(compile_kwargs={'literal_binds': True}))
+
+
+def test_parse_filter_with_module():
+    ''' test a sqlalchemy filter parse using a module of models '''
+    f = SQLAParser('modelb.z > 1').parse().filter(models)
+    ww = str(f.compile(compile_kwargs={'literal_binds': True}))
+    assert ww == 'modelb.z > 1.0'
+
+
+def test_parse_filter_with_module_update():
+    ''' test models added to a module after filtering are found '''
+    module = types.ModuleType('dbmodels')
+    module.ModelA = ModelA
+    SQLAParser('modela.x > 1').parse().filter(module)
+    module.ModelB = ModelB
+    f = SQLAParser('modelb.z > 1').parse().filter(module)
+    ww = str(f.compile(compile_kwargs={'literal_binds': True}))
+    assert ww == 'modelb.z > 1.0'
+
+
+def test_parse_filter_with_module_swap():
+    ''' test models swapped into a module after filtering are found '''
+    module = types.ModuleType('dbmodels')
+    module.ModelA = ModelA
+    module.other = 1
+    SQLAParser('modela.x > 1').parse().filter(module)
+    del module.other
+    module.ModelB = ModelB
+    f = SQLAParser('modelb.z > 1').parse().filter(module)
+    ww = str(f.compile(compile_kwargs={'literal_binds': True}))
+    assert ww == 'modelb.z > 1.0'
+
+
+class MyCondition(SQLAMixin, Condition):
+    ''' a custom SQLAlchemy condition action '''
+
+
+class MyParser(SQLAParser):
+    ''' a custom SQLAlchemy parser '''
+
+
+MyParser.build_parser(clauses=[condition, between_cond], actions=[MyCondition, MyCondition])
+
+
+@pytest.mark.parametrize('query, exp',
+                         [('modela.x > 5', 'modela.x > 5'),
+                          ('modela.x between 3 and 5', 'modela.x BETWEEN 3 AND 5'),
+                          ('modela.x between 3 and 5 or modela.name == Foo',
+                           "modela.x BETWEEN 3 AND 5 OR lower(modela.name) = 'foo'")],
+                         ids=['single', 'between', 'multi'])
+def test_custom_condition(query, exp):
+    ''' test a custom condition action using the SQLAMixin '''
+    e = MyParser(query).parse()
+    f = e.filter([ModelA, ModelB])
+    assert exp == str(f.compile(compile_kwargs={'literal_binds': True}))
+
+
+def test_bind_model_checks_models_once(monkeypatch):
+    ''' test binding a tree checks the input models only once '''
+    calls = []
+    check = SQLAMixin._check_models
+    monkeypatch.setattr(SQLAMixin, '_check_models',
+                        staticmethod(lambda classes: calls.append(classes) or check(classes)))
+    SQLAParser('modela.x > 5 and (modelb.z < 3 or not modela.y = 2)').parse().bind_model(
+        [ModelA, ModelB])
+    assert len(calls) == 1
+
+
+def test_bind_model_kept_on_filter():
+    ''' test filtering with explicit models leaves the bound models unchanged '''
+    alias = aliased(ModelA, name='other')
+    e = SQLAParser('x > 5').parse().bind_model(ModelA)
+    f = e.filter(alias)
+    assert str(f.compile(compile_kwargs={'literal_binds': True})) == 'other.x > 5'
+    f = e.filter()
+    assert str(f.compile(compile_kwargs={'literal_binds': True})) == 'modela.x > 5'
+
+
+def test_filter_releases_models():
+    ''' test filtering does not keep the input models alive '''
+    alias = aliased(ModelA, name='modela3')
+    ref = weakref.ref(alias)
+    e = SQLAParser('modela3.x > 5').parse()
+    for __ in range(2):
+        f = e.filter([ModelA, alias])
+        ww = str(f.compile(compile_kwargs={'literal_binds': True}))
+        assert ww == 'modela3.x > 5'
+    del alias, f
+    gc.collect()
+    assert ref() is None
+
+
 @pytest.fixture(autouse=True)
 def batch(model_a_factory):
     ''' batch create some models '''
@@ -115,6 +287,9 @@ def test_query(session):
         ('modela.bools != f" ', 20),
         ('modela.bools != 0" ', 20),
         ('modela.bools != no" ', 20),
+        ("modela.name != MODELX", 20),
+        ("modela.name = model or modela.name = nomatch", 20),
+        ("modela.name = nomatch or modela.name = model*", 20),
     ],
     ids=[
         "gtdate",
@@ -133,6 +308,9 @@ def test_query(session):
         "nebool_a",
         "nebool_b",
         "nebool_c",
+        "nestr",
+        "likestrs",
+        "likestrs_a",
     ],
 )
 def test_query_with_filter(session, val, exp):
@@ -140,3 +318,19 @@ def test_query_with_filter(session, val, exp):
     f = _make_filter(val)
     res = session.query(ModelA).filter(f).all()
     assert len(res) == exp
+
+
+@pytest.mark.parametrize(
+    "val, exp",
+    [
+        ('modela.name == "École"', 1),
+        ('modela.name != "École"', 20),
+    ],
+    ids=["eqstr", "nestr"],
+)
+def test_query_with_nonascii_filter(session, model_a_factory, val, exp):
+    ''' test a query with a parsed filter on a non-ascii string '''
+    model_a_factory.create(name='École')
+    f = _make_filter(val)
+    res = session.query(ModelA).filter(f).all()
+    assert len(res) == exp